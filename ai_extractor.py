@@ -37,7 +37,9 @@ def image_to_base64(image: Image.Image) -> tuple:
     Resizes and compresses to JPEG.
     Keep max side at 1024px, quality 75.
     """
-    img = image.convert("RGB")
+    # convert() copies even when the mode already matches; skip it for the
+    # RGB crops this usually receives
+    img = image if image.mode == "RGB" else image.convert("RGB")
     max_side = 1024
     w, h = img.size
     if max(w, h) > max_side:
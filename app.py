@@ -421,12 +421,18 @@ hr, [data-testid="stDivider"] { border-color: #1e1e1e !important; }
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _fetch_pil_from_url(url: str) -> "Image.Image | None":
-    """Download an image from a URL and return a PIL Image, or None on failure."""
+def _fetch_pil_from_url(url: str, max_px: int = 1024) -> "Image.Image | None":
+    """Download an image from a URL and return a PIL Image, or None on failure.
+    For JPEGs, draft mode lets libjpeg downscale during decode (by powers of
+    two, never below max_px per side) instead of decoding full resolution and
+    resizing afterwards. Other formats are unaffected.
+    """
     try:
         import urllib.request
         with urllib.request.urlopen(url, timeout=10) as resp:
-            return Image.open(io.BytesIO(resp.read())).copy()
+            img = Image.open(io.BytesIO(resp.read()))
+            img.draft("RGB", (max_px, max_px))
+            return img.copy()
     except Exception:
         return None
 
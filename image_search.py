@@ -1,27 +1,62 @@
 """Image similarity search using perceptual hashing."""
 
 import imagehash
+import numpy as np
 from PIL import Image
 
+# numpy >= 2.0 has a native vectorized popcount; fall back to unpackbits
+_bitwise_count = getattr(np, "bitwise_count", None)
+
+
+def _popcount_rows(xored: np.ndarray) -> np.ndarray:
+    """Per-row popcount of a 2-D uint8 array (one row per XORed hash)."""
+    if _bitwise_count is not None:
+        return _bitwise_count(xored).sum(axis=1, dtype=np.uint32)
+    return np.unpackbits(xored, axis=1).sum(axis=1, dtype=np.uint32)
+
 
 def compute_hash(image: Image.Image) -> str:
     return str(imagehash.phash(image, hash_size=16))
 
 
 def hash_distance(hash1: str, hash2: str) -> int:
+    """Hamming distance between two hex hash strings.
+    XOR of the hashes as ints + int.bit_count() — one C-level popcount
+    instead of parsing both hashes into imagehash bit arrays per call.
+    """
     try:
-        return imagehash.hex_to_hash(hash1) - imagehash.hex_to_hash(hash2)
-    except Exception:
+        if len(hash1) != len(hash2):
+            return 9999
+        return (int(hash1, 16) ^ int(hash2, 16)).bit_count()
+    except (TypeError, ValueError):
         return 9999
 
 
 def find_similar(query_image: Image.Image, stored: list, threshold: int = 20) -> list:
+    """Rank stored items by Hamming distance to the query image's hash.
+    All stored hashes are decoded into one byte matrix and the distances
+    computed with a single vectorized XOR + popcount, instead of one
+    hash_distance call per item. Malformed or mismatched hashes are skipped
+    (they could never pass the threshold anyway).
+    """
     query_hash = compute_hash(query_image)
-    results = []
+    qbytes = np.frombuffer(bytes.fromhex(query_hash), dtype=np.uint8)
+    candidates, rows = [], []
     for item in stored:
-        if not item.get("image_hash"):
+        h = item.get("image_hash")
+        if not h or len(h) != len(query_hash):
+            continue
+        try:
+            rows.append(np.frombuffer(bytes.fromhex(h), dtype=np.uint8))
+        except ValueError:
             continue
-        dist = hash_distance(query_hash, item["image_hash"])
-        if dist <= threshold:
-            results.append({**item, "similarity_score": max(0, 100 - dist)})
+        candidates.append(item)
+    if not candidates:
+        return []
+    dists = _popcount_rows(np.vstack(rows) ^ qbytes)
+    results = [
+        {**item, "similarity_score": max(0, 100 - int(dist))}
+        for item, dist in zip(candidates, dists)
+        if dist <= threshold
+    ]
     return sorted(results, key=lambda x: x["similarity_score"], reverse=True)
@@ -4,67 +4,245 @@ Uses PyMuPDF (fitz).
 """
 import re
 import io
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 import fitz  # PyMuPDF
+import numpy as np
 from PIL import Image
 
 
+_ai_module = None
+
+
+def _get_ai():
+    """Return the ai_extractor module, importing it on first use only.
+    The import stays lazy (ai_extractor pulls in streamlit, which the
+    standalone tools don't need), but the sys.modules lookup and attribute
+    resolution are paid once instead of on every page.
+    """
+    global _ai_module
+    if _ai_module is None:
+        import ai_extractor
+        _ai_module = ai_extractor
+    return _ai_module
+
+
+# ── Shared read-only document cache ──────────────────────────────────────────
+# Opening a fitz.Document re-parses the whole PDF, and the single-page
+# helpers (page count, previews, full-page renders) are called many times
+# with the same bytes. A small LRU keeps those documents open between calls.
+# The lock serializes use — fitz documents aren't thread-safe, and the app
+# renders from background threads. Long-running consumers (the render_pages
+# generator, extraction, price conversion) keep their own private opens so
+# they never hold the lock across slow work.
+_DOC_CACHE_SIZE = 4
+_doc_cache: "OrderedDict[int, fitz.Document]" = OrderedDict()
+_doc_lock = threading.RLock()
+
+
+@contextmanager
+def _shared_doc(pdf_bytes: bytes):
+    """Yield a cached read-only document for these bytes.
+    Callers must not close or mutate the yielded document, and must finish
+    with it before the context exits.
+    """
+    with _doc_lock:
+        key = hash(pdf_bytes)
+        doc = _doc_cache.pop(key, None)
+        if doc is None:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        _doc_cache[key] = doc
+        while len(_doc_cache) > _DOC_CACHE_SIZE:
+            _, oldest = _doc_cache.popitem(last=False)
+            oldest.close()
+        yield doc
+
+
+@lru_cache(maxsize=8)
 def get_page_count(pdf_bytes: bytes) -> int:
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    count = len(doc)
-    doc.close()
-    return count
+    with _shared_doc(pdf_bytes) as doc:
+        return len(doc)
 
 
-def render_single_page(pdf_bytes: bytes, page_num: int, dpi: int = 100) -> Image.Image:
-    """Render one specific page as a PIL Image. Memory efficient."""
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    page_num = min(page_num, len(doc) - 1)
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
-    pix = doc[page_num].get_pixmap(matrix=mat, alpha=False)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-    doc.close()
-    return img
+@lru_cache(maxsize=8)
+def _matrix(dpi: int) -> fitz.Matrix:
+    """Per-DPI zoom matrix, cached so page loops don't rebuild it."""
+    return fitz.Matrix(dpi / 72, dpi / 72)
 
 
-def render_pages(pdf_bytes: bytes, dpi: int = 100):
-    """Yield each page of a PDF as a PIL Image. Uses generator to save memory."""
+def _pix_to_array(pix) -> np.ndarray:
+    """RGB fitz.Pixmap → owned (h, w, 3) uint8 array with a single copy.
+    pix.samples_mv is a zero-copy memoryview of the pixmap buffer; one
+    explicit .copy() is required because that buffer dies with the pixmap.
+    """
+    arr = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    return arr.reshape(pix.height, pix.width, 3).copy()
+
+
+def _pix_to_image(pix) -> Image.Image:
+    """Convert an RGB fitz.Pixmap to a PIL Image with a single pixel copy.
+    pix.samples is itself a bytes copy of the pixmap buffer, and
+    Image.frombytes copies again; Image.fromarray over the one owned array
+    shares its buffer, halving the allocations.
+    """
+    return Image.fromarray(_pix_to_array(pix))
+
+
+def render_single_page(pdf_bytes: bytes, page_num: int, dpi: int = 100,
+                       as_array: bool = False):
+    """Render one specific page as a PIL Image. Memory efficient.
+    With as_array=True, returns the (h, w, 3) uint8 array instead -- callers
+    that go straight to NumPy skip the round trip through a PIL buffer.
+    """
+    with _shared_doc(pdf_bytes) as doc:
+        page_num = min(page_num, len(doc) - 1)
+        mat = _matrix(dpi)
+        pix = doc[page_num].get_pixmap(matrix=mat, alpha=False)
+        return _pix_to_array(pix) if as_array else _pix_to_image(pix)
+
+
+def render_pages(pdf_bytes: bytes, dpi: int = 100, num_workers: int = 1,
+                 as_array: bool = False):
+    """Yield each page of a PDF as a PIL Image. Uses generator to save memory.
+    With num_workers > 1, pages are rendered by a worker pool (each worker
+    opens its own document) but still yielded in page order, so callers keep
+    streaming with bounded memory while renders run ahead in parallel.
+    With as_array=True, yields (h, w, 3) uint8 arrays instead of PIL images.
+    """
+    if num_workers > 1:
+        n_pages = get_page_count(pdf_bytes)
+        if n_pages > 2:
+            tasks = [(pdf_bytes, p, dpi) for p in range(n_pages)]
+            with ProcessPoolExecutor(min(num_workers, n_pages)) as pool:
+                for _, w, h, data in pool.map(_render_one, tasks):
+                    if as_array:
+                        # Read-only view over the received bytes; no copy
+                        yield np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)
+                    else:
+                        yield Image.frombytes("RGB", (w, h), data)
+            return
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    mat = _matrix(dpi)
     for page in doc:
         pix = page.get_pixmap(matrix=mat, alpha=False)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        img = _pix_to_array(pix) if as_array else _pix_to_image(pix)
+        # Drop the pixmap buffer before handing control to the consumer so
+        # only one page's raw samples are ever held alongside its PIL copy
+        pix = None
         yield img
     doc.close()
+    # Flush MuPDF's internal resource store (decoded images, fonts) that a
+    # full-document render leaves behind
+    fitz.TOOLS.store_shrink(100)
 
 
-def _render_page_full(pdf_bytes: bytes, page_num: int, dpi: int = 150) -> Image.Image:
-    """Render one page at the given DPI and return as RGB PIL image."""
+def _render_one(args) -> tuple:
+    """Pool worker: render one page and return raw pixel data.
+    Each worker opens its own fitz.Document -- PyMuPDF serializes calls on a
+    shared document, so sharing one across processes would gain nothing.
+    Returns (page_num, width, height, rgb_bytes); PIL decode happens in the
+    main process so workers are never blocked on image construction.
+    """
+    pdf_bytes, page_num, dpi = args
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    mat = _matrix(dpi)
     pix = doc[page_num].get_pixmap(matrix=mat, alpha=False)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    result = (page_num, pix.width, pix.height, bytes(pix.samples_mv))
     doc.close()
-    return img
+    return result
 
 
-def _find_split_y(full: Image.Image) -> tuple:
+def _render_range_threaded(args) -> list:
+    """Thread worker: render a contiguous page range on a private document.
+    PyMuPDF serializes calls on a shared document, but independent
+    fitz.Document instances opened from the same bytes don't share state,
+    and get_pixmap releases the GIL while MuPDF rasterizes -- so one doc
+    per thread renders genuinely concurrently.
+    """
+    pdf_bytes, start, stop, dpi = args
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    mat = _matrix(dpi)
+    out = []
+    for p in range(start, stop):
+        pix = doc[p].get_pixmap(matrix=mat, alpha=False)
+        out.append((p, _pix_to_image(pix)))
+    doc.close()
+    return out
+
+
+def render_pages_parallel(pdf_bytes: bytes, dpi: int = 150,
+                          num_workers: int | None = None,
+                          use_threads: bool = False) -> list:
+    """Render all pages of a PDF in parallel. Returns a list of PIL Images
+    in page order. Falls back to the sequential generator for tiny PDFs
+    where process start-up would cost more than it saves.
+    use_threads=True runs the workers as threads, each with its own private
+    document -- no process spawn and no pickling of pdf_bytes per worker, at
+    the cost of the residual GIL contention outside get_pixmap. Usually the
+    better choice when the PDF is large and the page count is modest.
+    """
+    n_pages = get_page_count(pdf_bytes)
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 6)
+    num_workers = min(num_workers, n_pages)
+    if num_workers <= 1 or n_pages <= 2:
+        return list(render_pages(pdf_bytes, dpi=dpi))
+    if use_threads:
+        bounds = [round(i * n_pages / num_workers) for i in range(num_workers + 1)]
+        tasks = [(pdf_bytes, lo, hi, dpi)
+                 for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+        with ThreadPoolExecutor(len(tasks)) as pool:
+            chunks = pool.map(_render_range_threaded, tasks)
+        rendered = sorted((item for chunk in chunks for item in chunk),
+                          key=lambda r: r[0])
+        return [img for _, img in rendered]
+    tasks = [(pdf_bytes, p, dpi) for p in range(n_pages)]
+    with ProcessPoolExecutor(num_workers) as pool:
+        futures = [pool.submit(_render_one, t) for t in tasks]
+        rendered = [f.result() for f in as_completed(futures)]
+    rendered.sort(key=lambda r: r[0])
+    return [Image.frombytes("RGB", (w, h), data) for _, w, h, data in rendered]
+
+
+def _render_page(page, dpi: int = 150) -> Image.Image:
+    """Render an already-open fitz page at the given DPI as an RGB PIL image."""
+    mat = _matrix(dpi)
+    pix = page.get_pixmap(matrix=mat, alpha=False)
+    return _pix_to_image(pix)
+
+
+def _find_split_y(full: Image.Image, arr=None) -> tuple:
     """
     Scan the full page for the brightest horizontal band between 30-70% height.
     Returns (best_y, brightness).
     brightness > 235 means a clear separator between two stacked product families.
+    `arr` may pass a precomputed np.asarray(full) to avoid re-converting.
     """
     w, h = full.size
     scan_start = int(h * 0.30)
     scan_end = int(h * 0.70)
-    best_y, best_brightness = h // 2, 0.0
-    for y in range(scan_start, scan_end, 5):
-        strip = full.crop((0, y, w, y + 8))
-        pxls = list(strip.getdata())
-        bright = sum(r + g + b for r, g, b in pxls) / (len(pxls) * 3)
-        if bright > best_brightness:
-            best_brightness = bright
-            best_y = y + 4
-    return best_y, best_brightness
+    if scan_end <= scan_start:
+        return h // 2, 0.0
+    if arr is None:
+        arr = np.asarray(full if full.mode == "RGB" else full.convert("RGB"))
+    # Per-row pixel sums for the scan band (uint32 is safe: w*3*255 < 2^32)
+    row_sums = arr[scan_start:scan_end + 7].sum(axis=(1, 2), dtype=np.uint32)
+    # Brightness of the 8-row strip starting at each y via a running-sum
+    # difference, then keep every 5th y to match the original scan stride
+    csum = np.concatenate(([0], np.cumsum(row_sums, dtype=np.uint64)))
+    strip_sums = csum[8:] - csum[:-8]
+    candidates = strip_sums[: scan_end - scan_start: 5] / (w * 8 * 3)
+    if candidates.size == 0:
+        # Page shorter than one 8-row strip -- the band clamps at the image
+        # bottom and no candidate fits; degrade like the pre-NumPy scan did
+        return h // 2, 0.0
+    best = int(candidates.argmax())
+    return scan_start + best * 5 + 4, float(candidates[best])
 
 
 def _find_split_x(img: Image.Image) -> int | None:
@@ -77,34 +255,30 @@ def _find_split_x(img: Image.Image) -> int | None:
     Returns the x-pixel coordinate to crop to (keep everything left of that point),
     or None if no clear gap is found.
     """
-    import numpy as np
-    arr = np.array(img)
+    arr = np.asarray(img)
     h, w = arr.shape[:2]
     # Analyse only the left 80% -- beyond that we're already deep in text territory
     scan_to = max(10, int(w * 0.80))
-    # Column-wise fraction of dark pixels (any RGB channel < 200 = drawn content)
-    dark_col = (arr[:, :scan_to, :] < 200).any(axis=2).mean(axis=0)  # (scan_to,)
+    # Column-wise dark-pixel count in one fused reduction: a pixel is dark
+    # iff its darkest channel is < 200, so min over channels replaces the
+    # full-size comparison + any() temporary.
+    dark_count = (arr[:, :scan_to].min(axis=2) < 200).sum(axis=0)  # (scan_to,)
     # Tag each column as "gap" if < 4% of its pixels are dark
-    is_gap = dark_col < 0.04
-    # Collect runs of consecutive gap-columns
-    gaps, gap_start = [], None
-    for x in range(scan_to):
-        if is_gap[x]:
-            if gap_start is None:
-                gap_start = x
-        else:
-            if gap_start is not None:
-                gaps.append((gap_start, x))
-                gap_start = None
-    if gap_start is not None:
-        gaps.append((gap_start, scan_to))
+    is_gap = dark_count < 0.04 * h
+    # Collect runs of consecutive gap-columns via edge detection on the
+    # padded mask (same idiom as the border scan in _crop_to_drawing_box)
+    padded = np.r_[False, is_gap, False]
+    edges  = np.diff(padded.view(np.int8))
+    starts = np.flatnonzero(edges > 0)
+    ends   = np.flatnonzero(edges < 0)
     # Keep only gaps that are past the left margin and at least 2 px wide
     min_start = int(w * 0.15)
-    valid = [(s, e) for s, e in gaps if s >= min_start and (e - s) >= 2]
-    if not valid:
+    valid = (starts >= min_start) & ((ends - starts) >= 2)
+    if not valid.any():
         return None
     # Return the centre of the rightmost valid gap
-    s, e = valid[-1]
+    s = int(starts[valid][-1])
+    e = int(ends[valid][-1])
     return (s + e) // 2
 
 
@@ -164,14 +338,12 @@ def _find_drawing_rects(page) -> list:
     pw = page.rect.width
     ph = page.rect.height
     # -- 1. Find diameter label positions ----
-    label_pts = []
-    for block in page.get_text("dict").get("blocks", []):
-        for line in block.get("lines", []):
-            for span in line.get("spans", []):
-                txt = span.get("text", "")
-                if "\u00d8" in txt or "\u00f8" in txt:
-                    b = span["bbox"]
-                    label_pts.append(((b[0] + b[2]) / 2, (b[1] + b[3]) / 2))
+    # search_for locates the glyphs in C without decoding the full text dict
+    label_pts = [
+        ((r.x0 + r.x1) / 2, (r.y0 + r.y1) / 2)
+        for glyph in ("\u00d8", "\u00f8")
+        for r in page.search_for(glyph, quads=False)
+    ]
     # -- 2. Collect rectangle-shaped border strokes in the LEFT zone ----
     rect_pool = []
     for path in page.get_drawings():
@@ -191,15 +363,26 @@ def _find_drawing_rects(page) -> list:
         return []
     # -- 3. Anchor on diameter labels -> find smallest containing rect ----
     if label_pts:
+        # Batched containment: rects as an (N, 4) array against label points
+        # as (M, 2); one broadcast comparison replaces the per-label loop
+        # over the whole pool.
+        rects_arr = np.array([(r.x0, r.y0, r.x1, r.y1) for r in rect_pool])
+        pts = np.array(label_pts)
+        contains = (
+            (rects_arr[None, :, 0] <= pts[:, 0:1])
+            & (pts[:, 0:1] <= rects_arr[None, :, 2])
+            & (rects_arr[None, :, 1] <= pts[:, 1:2])
+            & (pts[:, 1:2] <= rects_arr[None, :, 3])
+        )
+        areas = ((rects_arr[:, 2] - rects_arr[:, 0])
+                 * (rects_arr[:, 3] - rects_arr[:, 1]))
+        smallest = np.where(contains, areas[None, :], np.inf).argmin(axis=1)
+        any_contains = contains.any(axis=1)
         found, seen = [], set()
-        for px, py in label_pts:
-            containing = [
-                r for r in rect_pool
-                if r.x0 <= px <= r.x1 and r.y0 <= py <= r.y1
-            ]
-            if not containing:
+        for i in range(len(label_pts)):
+            if not any_contains[i]:
                 continue
-            best = min(containing, key=lambda r: r.width * r.height)
+            best = rect_pool[int(smallest[i])]
             key = (round(best.x0), round(best.y0))
             if key not in seen:
                 seen.add(key)
@@ -212,15 +395,16 @@ def _find_drawing_rects(page) -> list:
     return rect_pool[:6]
 
 
-def _extend_crop_to_content(full, x0, y0, x1, y1, px_w, px_h):
+def _extend_crop_to_content(full, x0, y0, x1, y1, px_w, px_h, arr=None):
     """
     Extend a detected rectangle's crop boundaries upward to capture the full
     lamp drawing including ceiling mounts and stems that extend above the
     bordered box in the PDF.
     Returns (new_x0, new_y0, new_x1, new_y1).
+    `arr` may pass a precomputed np.asarray(full) to avoid re-converting.
     """
-    import numpy as np
-    arr = np.array(full)
+    if arr is None:
+        arr = np.asarray(full)
     # Use the horizontal range of the rect (with some margin)
     margin_x = int((x1 - x0) * 0.1)
     scan_x0 = max(0, x0 - margin_x)
@@ -230,23 +414,22 @@ def _extend_crop_to_content(full, x0, y0, x1, y1, px_w, px_h):
     # Maximum upward extension: go up to 80% of the rect's own height above it
     max_extend = int((y1 - y0) * 0.8)
     scan_top = max(0, y0 - max_extend)
-    for scan_y in range(y0 - 1, scan_top - 1, -1):
-        row_strip = arr[scan_y, scan_x0:scan_x1, :]
-        dark_pixels = (row_strip < 200).any(axis=1)
-        dark_fraction = dark_pixels.mean()
-        if dark_fraction > 0.005:
-            new_y0 = scan_y
-        else:
-            # Bridge small gaps (e.g. between stem and ceiling mount)
-            found_more = False
-            for ahead in range(1, min(26, scan_y - scan_top + 1)):
-                ahead_row = arr[scan_y - ahead, scan_x0:scan_x1, :]
-                ahead_dark = (ahead_row < 200).any(axis=1).mean()
-                if ahead_dark > 0.005:
-                    found_more = True
-                    break
-            if not found_more:
-                break
+    if scan_top < y0:
+        # Classify every row in the scan band at once, then walk the content
+        # rows from the bottom up: a row is reachable while each gap of
+        # empty rows along the way is small enough to bridge (e.g. between
+        # stem and ceiling mount).
+        band = arr[scan_top:y0, scan_x0:scan_x1]
+        is_content = (band.min(axis=2) < 200).mean(axis=1) > 0.005
+        content_rows = np.flatnonzero(is_content) + scan_top
+        if content_rows.size:
+            rows_desc = content_rows[::-1]
+            prev = np.concatenate(([y0], rows_desc[:-1]))
+            gaps = prev - rows_desc - 1          # empty rows before each content row
+            bridgeable = gaps <= 25
+            k = len(rows_desc) if bridgeable.all() else int(np.argmin(bridgeable))
+            if k > 0:
+                new_y0 = int(rows_desc[k - 1])
     # Add padding around the final crop
     pad = 10
     new_y0 = max(0, new_y0 - pad)
@@ -273,14 +456,25 @@ def extract_page_images(pdf_bytes: bytes, page_num: int, api_key: str = None) ->
           'dim': [PIL.Image, ...],      # dimension drawings, sorted top-to-bottom
       }
     """
+    # -- Open the document once: the 150 DPI render and the vector-rect
+    # fallback both work from the same fitz.Document ----
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        return _extract_page_images(doc, page_num, api_key)
+    finally:
+        doc.close()
+
+
+def _extract_page_images(doc, page_num: int, api_key: str = None) -> dict:
+    page = doc[page_num]
     # -- Render page at 150 DPI (needed by all paths) ----
-    full = _render_page_full(pdf_bytes, page_num, dpi=150)
+    full = _render_page(page, dpi=150)
     px_w, px_h = full.size
     dim_imgs = []
     product_imgs = []
     # -- Path 1: AI bounding-box detection ----
     if api_key:
-        import ai_extractor as ai
+        ai = _get_ai()
         # -- Dimension drawings --
         boxes = ai.find_dim_boxes(api_key, full)
         if boxes:
@@ -312,12 +506,11 @@ def extract_page_images(pdf_bytes: bytes, page_num: int, api_key: str = None) ->
         if dim_imgs:
             return {"product": product_imgs, "dim": dim_imgs}
     # -- Path 2: PyMuPDF vector-rect detection (dim drawings only) ----
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    page = doc[page_num]
+    # Paths 2 and 3 both scan the page pixels; convert once and share.
+    full_arr = np.asarray(full)
     page_w = page.rect.width
     page_h = page.rect.height
     rects = _find_drawing_rects(page)
-    doc.close()
     sx = px_w / page_w
     sy = px_h / page_h
     if rects:
@@ -329,7 +522,7 @@ def extract_page_images(pdf_bytes: bytes, page_num: int, api_key: str = None) ->
             ry1 = int(r.y1 * sy)
             # Extend the crop upward to capture ceiling mounts and stems
             ex0, ey0, ex1, ey1 = _extend_crop_to_content(
-                full, rx0, ry0, rx1, ry1, px_w, px_h
+                full, rx0, ry0, rx1, ry1, px_w, px_h, arr=full_arr
             )
             crop = full.crop((ex0, ey0, ex1, ey1))
             if crop.width > 40 and crop.height > 40:
@@ -338,15 +531,20 @@ def extract_page_images(pdf_bytes: bytes, page_num: int, api_key: str = None) ->
             return {"product": product_imgs, "dim": dim_imgs}
     # -- Path 3: zone-based fallback ----
     draw_right = int(px_w * 0.35)
-    best_y, best_brightness = _find_split_y(full)
+    best_y, best_brightness = _find_split_y(full, arr=full_arr)
     two_products = best_brightness > 235 and (0.25 * px_h < best_y < 0.75 * px_h)
-    regions = (
-        [full.crop((0, 0, draw_right, best_y)),
-         full.crop((0, best_y, draw_right, px_h))]
+    boxes = (
+        [(0, 0, draw_right, best_y), (0, best_y, draw_right, px_h)]
         if two_products
-        else [full.crop((0, 0, draw_right, px_h))]
+        else [(0, 0, draw_right, px_h)]
     )
-    dim_imgs = [t for r in regions if (t := _trim_whitespace_dim(r)) is not None]
+    # Analyse each region through a view of the shared page array; only the
+    # kept result is cropped out of the PIL image.
+    dim_imgs = [
+        t for (bx0, by0, bx1, by1) in boxes
+        if (t := _trim_whitespace_dim(full.crop((bx0, by0, bx1, by1)),
+                                      arr=full_arr[by0:by1, bx0:bx1])) is not None
+    ]
     return {"product": product_imgs, "dim": dim_imgs}
 
 
@@ -363,16 +561,16 @@ def _trim_whitespace(img: Image.Image, threshold: int = 245) -> Image.Image | No
     densest illustration zone to remove text headers / peripheral annotations.
     Returns None if the entire image is blank.
     """
-    import numpy as np
-    arr = np.array(img)
-    # Mask of non-white pixels (any channel below threshold)
-    mask = (arr < threshold).any(axis=2)
-    rows = mask.any(axis=1)
-    cols = mask.any(axis=0)
-    if not rows.any():
+    arr = np.asarray(img)
+    # Mask of non-white pixels: darkest channel below threshold (one fused
+    # reduction), extents straight from the nonzero row/column indices
+    mask = arr.min(axis=2) < threshold
+    rows_nz = np.flatnonzero(mask.any(axis=1))
+    if rows_nz.size == 0:
         return None
-    r_min, r_max = rows.argmax(), len(rows) - rows[::-1].argmax()
-    c_min, c_max = cols.argmax(), len(cols) - cols[::-1].argmax()
+    cols_nz = np.flatnonzero(mask.any(axis=0))
+    r_min, r_max = int(rows_nz[0]), int(rows_nz[-1]) + 1
+    c_min, c_max = int(cols_nz[0]), int(cols_nz[-1]) + 1
     # Tight padding
     pad = 6
     r_min = max(0, r_min - pad)
@@ -381,18 +579,21 @@ def _trim_whitespace(img: Image.Image, threshold: int = 245) -> Image.Image | No
     c_max = min(img.width, c_max + pad)
     trimmed = img.crop((c_min, r_min, c_max, r_max))
     # -- Focus on the densest illustration zone ----
-    arr2 = np.array(trimmed)
+    # Slice the array we already have instead of re-converting the crop
+    arr2 = arr[r_min:r_max, c_min:c_max]
     h2, w2 = arr2.shape[:2]
     if h2 < 40:
         return trimmed
-    dark_row = (arr2 < 180).any(axis=2).mean(axis=1)
+    dark_row = (arr2.min(axis=2) < 180).mean(axis=1)
     win = max(20, int(h2 * 0.55))
-    best_start, best_score = 0, -1.0
-    for y in range(0, h2 - win + 1, 3):
-        score = dark_row[y: y + win].sum()
-        if score > best_score:
-            best_score = score
-            best_start = y
+    if win > h2:
+        best_start = 0
+    else:
+        # Window scores via a running-sum difference, keeping the original
+        # 3-row stride and first-maximum tie-breaking
+        csum = np.concatenate(([0.0], np.cumsum(dark_row)))
+        scores = (csum[win:] - csum[:-win])[::3]
+        best_start = int(scores.argmax()) * 3
     best_end = min(h2, best_start + win)
     top_skip = best_start
     bot_skip = h2 - best_end
@@ -419,8 +620,7 @@ def _crop_to_drawing_box(img: Image.Image,
     Scans rows top-to-bottom; the first row whose longest consecutive run of pixels
     darker than `dark_thresh` spans ≥ 60 % of the image width is the box border.
     """
-    import numpy as np
-    arr  = np.array(img.convert("L"))
+    arr  = np.asarray(img.convert("L"))
     h, w = arr.shape
 
     for y in range(h):
@@ -441,23 +641,26 @@ def _crop_to_drawing_box(img: Image.Image,
     return img   # no solid border found — return unchanged
 
 
-def _trim_whitespace_dim(img: Image.Image, threshold: int = 248) -> Image.Image | None:
+def _trim_whitespace_dim(img: Image.Image, threshold: int = 248,
+                         arr=None) -> Image.Image | None:
     """
     Light whitespace trim for dimension drawings -- keeps more context
     than the product-illustration trim so measurement labels at the edges
     aren't cut off.
+    `arr` may pass a precomputed np.asarray(img) (or a view of the parent
+    page array covering the same region) to avoid re-converting.
     """
-    import numpy as np
-    arr = np.array(img)
-    mask = (arr < threshold).any(axis=2)
-    rows = mask.any(axis=1)
-    cols = mask.any(axis=0)
-    if not rows.any():
+    if arr is None:
+        arr = np.asarray(img)
+    mask = arr.min(axis=2) < threshold
+    rows_nz = np.flatnonzero(mask.any(axis=1))
+    if rows_nz.size == 0:
         return None
-    r_min = max(0, rows.argmax() - 12)
-    r_max = min(img.height, len(rows) - rows[::-1].argmax() + 12)
-    c_min = max(0, cols.argmax() - 12)
-    c_max = min(img.width, len(cols) - cols[::-1].argmax() + 12)
+    cols_nz = np.flatnonzero(mask.any(axis=0))
+    r_min = max(0, int(rows_nz[0]) - 12)
+    r_max = min(img.height, int(rows_nz[-1]) + 1 + 12)
+    c_min = max(0, int(cols_nz[0]) - 12)
+    c_max = min(img.width, int(cols_nz[-1]) + 1 + 12)
     cropped = img.crop((c_min, r_min, c_max, r_max))
     return cropped if cropped.width > 20 and cropped.height > 20 else None
 
@@ -525,17 +728,28 @@ def _find_price_column_headers(page, from_currency: str) -> list:
     return price_cols
 
 
+# _parse_price format pattern: both comma-decimal layouts decided in one
+# match, branched on which named group fired
+_PAT_NUM_FMT = re.compile(
+    r'^(?:(?P<eur>\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?)|(?P<comma>\d+(?:,\d{1,2})))$'
+)
+
+
+@lru_cache(maxsize=4096)
 def _parse_price(price_str: str) -> float | None:
     """
     Parse a price string that may use comma or dot as decimal separator.
     Examples: "14469,00" -> 14469.0 | "1.234,50" -> 1234.5 | "1234.50" -> 1234.5
+    Memoized: catalogs repeat the same price strings across tables and index
+    pages, and the function is pure.
     """
     s = price_str.strip()
+    m = _PAT_NUM_FMT.match(s)
     # Case: European format "1.234,50" -- dot as thousands, comma as decimal
-    if re.match(r'^\d{1,3}(\.\d{3})+(,\d{1,2})?$', s):
+    if m and m.group("eur"):
         s = s.replace('.', '').replace(',', '.')
     # Case: "14469,00" -- comma as decimal only
-    elif re.match(r'^\d+(,\d{1,2})$', s):
+    elif m:
         s = s.replace(',', '.')
     # Case: already dot decimal "1234.50"
     else:
@@ -619,6 +833,49 @@ def _insert_fitted(page, bbox, text: str, fsize: float, rgb: tuple,
                      fontsize=actual_fsize, color=rgb)
 
 
+@lru_cache(maxsize=32)
+def _writer_font(fontname: str) -> fitz.Font:
+    """fitz.Font for a span's font name, falling back to Helvetica.
+    Embedded subset names (e.g. 'ABCDE+Frutiger') aren't loadable, so most
+    non-base-14 names land on the fallback -- the same behaviour the
+    insert_text path has always had.
+    """
+    for attempt in (fontname, "Helvetica", "helv"):
+        try:
+            return fitz.Font(attempt)
+        except Exception:
+            continue
+    return fitz.Font("helv")
+
+
+def _write_redactions(page, redactions: list) -> None:
+    """Insert all replacement texts for a page in batched form.
+    One fitz.TextWriter per distinct colour (write_text takes a single
+    colour) collects every placement and commits with one content-stream
+    append, instead of one insert_text -- and one stream append -- per
+    price. Placement logic mirrors _insert_fitted; on any writer failure
+    the per-price path takes over for the whole page.
+    """
+    by_color: dict = {}
+    for bbox, new_text, fsize, rgb, fontname, align in redactions:
+        by_color.setdefault(rgb, []).append((bbox, new_text, fsize, fontname, align))
+    for rgb, entries in by_color.items():
+        tw = fitz.TextWriter(page.rect)
+        for bbox, text, fsize, fontname, align in entries:
+            font = _writer_font(fontname)
+            bbox_w = max(1.0, bbox.x1 - bbox.x0)
+            tw_len = font.text_length(text, fontsize=fsize)
+            actual_fsize = fsize
+            if align == "right" and tw_len > bbox_w:
+                min_fsize = max(fsize * 0.7, 7.0)
+                actual_fsize = max(fsize * (bbox_w / tw_len), min_fsize)
+                tw_len = font.text_length(text, fontsize=actual_fsize)
+            x = max(bbox.x0, bbox.x1 - tw_len) if align == "right" else bbox.x0
+            y = bbox.y0 + actual_fsize * 0.85
+            tw.append((x, y), text, font=font, fontsize=actual_fsize)
+        tw.write_text(page, color=rgb)
+
+
 def _merge_adjacent_label_price(redactions: list, tc: str) -> list:
     """
     Post-processing pass: find (standalone-label, standalone-price) pairs
@@ -730,8 +987,46 @@ def _span_substr_bbox(span_bbox, span_text: str, start: int, end: int):
     return fitz.Rect(sub_x0, y0, sub_x1, y1)
 
 
+# ── Price patterns (shared by every convert_prices call) ────────────────────
+# _DEC: prices with an explicit decimal separator and exactly 2 decimal
+# digits.  The (?!\d) at the end prevents partial matching — e.g. without
+# it, "1.245" (European thousands for 1 245) would be grabbed as "1.24".
+_DEC  = r"(?:\d{1,3}(?:[.,]\d{3})*[.,]\d{2}|\d+[.,]\d{2})(?!\d)"
+# _BARE: integers that may use dot-thousands (1.245) or are 1–6 digits.
+# Single-digit prices are included (changed from \d{2,6} to \d{1,6}).
+_BARE = r"(?:\d{1,3}(?:\.\d{3})+|\d{1,6})"
+
+# B: standalone decimal
+_PAT_PRICE = re.compile(_DEC)
+_PAT_DIGIT = re.compile(r"\d")
+# C: standalone bare
+_PAT_BARE  = re.compile(r"(?<![.,\d])" + _BARE + r"(?!\d|[.,]\d|[A-Za-z°%])")
+
+
+@lru_cache(maxsize=16)
+def _currency_patterns(esc: str) -> dict:
+    """Compile the currency-dependent patterns once per escaped marker.
+    Keyed by the escaped currency string so repeated conversions (and the
+    per-page loop) reuse the same compiled objects.
+    """
+    return {
+        # A: combined units (group 1 always captures the numeric part)
+        "pfx_bare": re.compile(esc + r"\s*(" + _BARE + r")(?!\d|[.,]\d|[A-Za-z°%])",    re.IGNORECASE),
+        "sfx_bare": re.compile(r"(?<![.,\d])(" + _BARE + r")(?!\d|[.,]\d|[A-Za-z°%])\s*" + esc, re.IGNORECASE),
+        "pfx_dec":  re.compile(esc + r"\s*(" + _DEC  + r")",                             re.IGNORECASE),
+        "sfx_dec":  re.compile(r"(" + _DEC  + r")\s*" + esc,                             re.IGNORECASE),
+        # D: standalone label
+        "label":    re.compile(esc, re.IGNORECASE),
+        # Page prefilter: marker or decimal price in one alternation, so a
+        # price-free page is rejected with a single scan
+        "quick":    re.compile(esc + r"|" + _DEC, re.IGNORECASE),
+    }
+
+
 def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
-                   to_currency: str, progress_cb=None) -> bytes:
+                   to_currency: str, progress_cb=None,
+                   fast_whiteout: bool = False,
+                   fast_save: bool = False) -> bytes:
     """
     Convert every price in a PDF from one currency to another and replace the
     currency label/symbol.
@@ -755,6 +1050,18 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
 
     Redaction boxes are expanded by 1 pt each side to guarantee full coverage.
     Replacement text always uses the original span's colour and font.
+
+    fast_whiteout=True covers the old prices with white rectangles (one
+    batched Shape per page) instead of running the redaction engine, which
+    rewrites the page content stream. Much faster on large catalogs, but the
+    original text survives underneath -- still extractable and copyable --
+    so it is only suitable for previews, never for documents leaving the
+    house. Default stays the true redaction.
+
+    fast_save=True saves with garbage=1 instead of garbage=4: unreferenced
+    objects (the redacted originals) are still dropped, but the full
+    object-graph dedup sweep is skipped. Larger output, much faster save on
+    big catalogs -- pairs naturally with fast_whiteout for previews.
     """
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     fc  = from_currency.strip()
@@ -763,30 +1070,17 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
     n_pages = len(doc)
 
     fc_is_symbol = len(fc) <= 2 and not fc.isalpha()
-
-    # ── Patterns ─────────────────────────────────────────────────────────────
-    # _DEC: prices with an explicit decimal separator and exactly 2 decimal
-    # digits.  The (?!\d) at the end prevents partial matching — e.g. without
-    # it, "1.245" (European thousands for 1 245) would be grabbed as "1.24".
-    _DEC  = r"(?:\d{1,3}(?:[.,]\d{3})*[.,]\d{2}|\d+[.,]\d{2})(?!\d)"
-    # _BARE: integers that may use dot-thousands (1.245) or are 1–6 digits.
-    # Single-digit prices are included (changed from \d{2,6} to \d{1,6}).
-    _BARE = r"(?:\d{1,3}(?:\.\d{3})+|\d{1,6})"
-
-    # A: combined units (group 1 always captures the numeric part)
-    # IMPORTANT: bare patterns run BEFORE decimal patterns so that European
-    # thousands-only prices like "€ 1.245" are captured as 1245 (bare) and
-    # NOT as 1.24 (decimal).
-    pat_pfx_bare = re.compile(esc + r"\s*(" + _BARE + r")(?!\d|[.,]\d|[A-Za-z°%])",    re.IGNORECASE)
-    pat_sfx_bare = re.compile(r"(?<![.,\d])(" + _BARE + r")(?!\d|[.,]\d|[A-Za-z°%])\s*" + esc, re.IGNORECASE)
-    pat_pfx_dec  = re.compile(esc + r"\s*(" + _DEC  + r")",                             re.IGNORECASE)
-    pat_sfx_dec  = re.compile(r"(" + _DEC  + r")\s*" + esc,                             re.IGNORECASE)
-    # B: standalone decimal
-    pat_price = re.compile(_DEC)
-    # C: standalone bare
-    pat_bare  = re.compile(r"(?<![.,\d])" + _BARE + r"(?!\d|[.,]\d|[A-Za-z°%])")
-    # D: standalone label
-    pat_label = re.compile(esc, re.IGNORECASE)
+    fc_upper = fc.upper()
+
+    # ── Patterns (module-scope compiles; currency ones cached per marker) ────
+    pats = _currency_patterns(esc)
+    pat_pfx_bare = pats["pfx_bare"]
+    pat_sfx_bare = pats["sfx_bare"]
+    pat_pfx_dec  = pats["pfx_dec"]
+    pat_sfx_dec  = pats["sfx_dec"]
+    pat_price = _PAT_PRICE
+    pat_bare  = _PAT_BARE
+    pat_label = pats["label"]
 
     def _get_bbox(chars, span_bbox, span_text, start, end):
         b = _chars_bbox(chars, start, end)
@@ -799,11 +1093,22 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
             progress_cb(page_idx / n_pages, f"Page {page_idx + 1} / {n_pages}")
 
         page_text = page.get_text()
-        if not fc_is_symbol and fc.upper() not in page_text.upper():
+        if not fc_is_symbol and fc_upper not in page_text.upper():
+            continue
+        # Cheap reject before the expensive rawdict extraction: every tier
+        # needs either the currency marker (A, C, D and the column headers)
+        # or a decimal-formatted number (B), so a page with neither cannot
+        # produce a redaction.
+        if not pats["quick"].search(page_text):
             continue
 
-        price_cols = _find_price_column_headers(page, fc)
-        raw        = page.get_text("rawdict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        # Header scan decodes the full text dict; a page with no currency
+        # text anywhere cannot contain a currency column header.
+        if pat_label.search(page_text):
+            price_cols = _find_price_column_headers(page, fc)
+        else:
+            price_cols = []
+        raw = page.get_text("rawdict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
         redactions = []   # (bbox, new_text, fsize, rgb, fontname, align)
 
         for block in raw.get("blocks", []):
@@ -820,10 +1125,19 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                     span_map.append((len(line_text), len(line_text) + len(t), sp))
                     line_text += t
 
+                # One cheap sweep over the concatenated line text first: a
+                # line with no digit and no currency marker cannot match any
+                # tier, so skip it before the per-span pattern runs.
+                if not _PAT_DIGIT.search(line_text) \
+                        and not pat_label.search(line_text):
+                    continue
+
                 line_has_currency = bool(pat_label.search(line_text))
 
-                # LINE-LEVEL claimed set (positions in line_text)
-                line_claimed: set = set()
+                # LINE-LEVEL claim mask (positions in line_text): a
+                # bytearray so range checks and updates are C-level slice
+                # operations instead of per-index set lookups
+                line_claimed = bytearray(len(line_text))
 
                 # Helper: merged bbox for a range of line_text positions
                 def _line_bbox(lstart, lend):
@@ -874,7 +1188,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                     (pat_sfx_dec,  "suffix"),
                 ):
                     for m in pat.finditer(line_text):
-                        if any(i in line_claimed for i in range(m.start(), m.end())):
+                        if any(line_claimed[m.start():m.end()]):
                             continue
                         parsed = _parse_price(m.group(1))
                         if parsed is None or parsed < 1:
@@ -886,7 +1200,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                         new_price = _format_price_num(parsed * multiplier)
                         new_text  = (tc + new_price) if order == "prefix" \
                                     else (new_price + tc)
-                        line_claimed.update(range(m.start(), m.end()))
+                        line_claimed[m.start():m.end()] = b"\x01" * (m.end() - m.start())
                         redactions.append((bbox, new_text, fsize, rgb, fontname, "left"))
 
                 # ── B / C / D: span-level tiers for remaining positions ────────
@@ -917,7 +1231,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                     # B: standalone decimal prices
                     for m in pat_price.finditer(span_text):
                         lstart, lend = sm_start + m.start(), sm_start + m.end()
-                        if any(i in line_claimed for i in range(lstart, lend)):
+                        if any(line_claimed[lstart:lend]):
                             continue
                         parsed = _parse_price(m.group())
                         if parsed is None or parsed < 1:
@@ -926,7 +1240,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                                          m.start(), m.end())
                         if bbox is None:
                             continue
-                        line_claimed.update(range(lstart, lend))
+                        line_claimed[lstart:lend] = b"\x01" * (lend - lstart)
                         redactions.append(
                             (bbox, _format_price_num(parsed * multiplier),
                              fsize, rgb, fontname, "right"))
@@ -940,7 +1254,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                     if span_in_col or line_has_currency:
                         for m in pat_bare.finditer(span_text):
                             lstart, lend = sm_start + m.start(), sm_start + m.end()
-                            if any(i in line_claimed for i in range(lstart, lend)):
+                            if any(line_claimed[lstart:lend]):
                                 continue
                             # If NOT in a price column, check proximity to
                             # the currency symbol in the line text to avoid
@@ -962,7 +1276,7 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                                              m.start(), m.end())
                             if bbox is None:
                                 continue
-                            line_claimed.update(range(lstart, lend))
+                            line_claimed[lstart:lend] = b"\x01" * (lend - lstart)
                             redactions.append(
                                 (bbox, _format_price_num(parsed * multiplier),
                                  fsize, rgb, fontname, "right"))
@@ -970,13 +1284,13 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
                     # D: standalone currency labels
                     for m in pat_label.finditer(span_text):
                         lstart, lend = sm_start + m.start(), sm_start + m.end()
-                        if any(i in line_claimed for i in range(lstart, lend)):
+                        if any(line_claimed[lstart:lend]):
                             continue
                         bbox = _get_bbox(chars, span_bbox, span_text,
                                          m.start(), m.end())
                         if bbox is None:
                             continue
-                        line_claimed.update(range(lstart, lend))
+                        line_claimed[lstart:lend] = b"\x01" * (lend - lstart)
                         redactions.append(
                             (bbox, tc, fsize, rgb, fontname, "left"))
 
@@ -1004,19 +1318,87 @@ def convert_prices(pdf_bytes: bytes, from_currency: str, multiplier: float,
         redactions = _merge_adjacent_label_price(redactions, tc)
 
         # 1. Whiteout — expand each box by 1 pt to guarantee full coverage
-        for bbox, *_ in redactions:
-            pad = fitz.Rect(bbox.x0 - 1, bbox.y0 - 1, bbox.x1 + 1, bbox.y1 + 1)
-            page.add_redact_annot(pad, fill=(1, 1, 1))
-        page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+        if fast_whiteout:
+            shape = page.new_shape()
+            for bbox, *_ in redactions:
+                shape.draw_rect(fitz.Rect(bbox.x0 - 1, bbox.y0 - 1,
+                                          bbox.x1 + 1, bbox.y1 + 1))
+            shape.finish(color=None, fill=(1, 1, 1))
+            shape.commit(overlay=True)
+        else:
+            for bbox, *_ in redactions:
+                pad = fitz.Rect(bbox.x0 - 1, bbox.y0 - 1, bbox.x1 + 1, bbox.y1 + 1)
+                page.add_redact_annot(pad, fill=(1, 1, 1))
+            page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
 
-        # 2. Insert converted text
-        for bbox, new_text, fsize, rgb, fontname, align in redactions:
-            _insert_fitted(page, bbox, new_text, fsize, rgb, fontname, align=align)
+        # 2. Insert converted text — batched (one stream append per colour);
+        # per-price insert_text remains as the fallback
+        try:
+            _write_redactions(page, redactions)
+        except Exception:
+            for bbox, new_text, fsize, rgb, fontname, align in redactions:
+                _insert_fitted(page, bbox, new_text, fsize, rgb, fontname,
+                               align=align)
 
     if progress_cb:
         progress_cb(1.0, "Finalizing…")
 
     buf = io.BytesIO()
-    doc.save(buf, garbage=4, deflate=True)
+    doc.save(buf, garbage=1 if fast_save else 4, deflate=True)
     doc.close()
     return buf.getvalue()
+
+
+def _convert_range(args) -> bytes:
+    """Pool worker: convert prices on a contiguous page range.
+    Extracts the range into a standalone sub-PDF and runs convert_prices on
+    it; detection and replacement are strictly per-page, so shard results
+    match the sequential path.
+    """
+    pdf_bytes, start, stop, from_currency, multiplier, to_currency = args
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    doc.select(list(range(start, stop)))
+    sub = doc.tobytes()
+    doc.close()
+    return convert_prices(sub, from_currency, multiplier, to_currency)
+
+
+def convert_prices_parallel(pdf_bytes: bytes, from_currency: str,
+                            multiplier: float, to_currency: str,
+                            progress_cb=None,
+                            num_workers: int | None = None) -> bytes:
+    """Parallel variant of convert_prices for large catalogs.
+    Splits the document into contiguous page-range shards, converts each in
+    a worker process with its own fitz.Document, and stitches the converted
+    shards back together in order. Progress is reported per finished shard.
+    Small documents fall through to the sequential path.
+    """
+    n_pages = get_page_count(pdf_bytes)
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 6)
+    num_workers = min(num_workers, n_pages)
+    if num_workers <= 1 or n_pages <= 3:
+        return convert_prices(pdf_bytes, from_currency, multiplier,
+                              to_currency, progress_cb)
+    bounds = [round(i * n_pages / num_workers) for i in range(num_workers + 1)]
+    tasks = [
+        (pdf_bytes, bounds[i], bounds[i + 1],
+         from_currency, multiplier, to_currency)
+        for i in range(num_workers)
+        if bounds[i] < bounds[i + 1]
+    ]
+    merged = fitz.open()
+    with multiprocessing.Pool(len(tasks)) as pool:
+        for done, shard_bytes in enumerate(pool.imap(_convert_range, tasks), 1):
+            shard = fitz.open(stream=shard_bytes, filetype="pdf")
+            merged.insert_pdf(shard)
+            shard.close()
+            if progress_cb:
+                progress_cb(done / len(tasks),
+                            f"Converted {done} / {len(tasks)} sections")
+    if progress_cb:
+        progress_cb(1.0, "Finalizing…")
+    buf = io.BytesIO()
+    merged.save(buf, garbage=4, deflate=True)
+    merged.close()
+    return buf.getvalue()
@@ -5,6 +5,7 @@ Drag-and-drop or browse for a PDF, convert all prices, save the result.
 Works on macOS and Windows. Requires: pip install PyMuPDF
 """
 import os, re, io, sys, threading
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
@@ -19,11 +20,22 @@ except ImportError:
 # Price conversion engine (extracted from pdf_processor.py)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_PAT_PRICE = re.compile(r'\d{1,3}(?:[.,]\d{3})*[.,]\d{2}|\d+[.,]\d{2}')
+_PAT_EURO_FMT  = re.compile(r'^\d{1,3}(\.\d{3})+(,\d{1,2})?$')
+_PAT_COMMA_DEC = re.compile(r'^\d+(,\d{1,2})$')
+
+
+@lru_cache(maxsize=16)
+def _label_pattern(esc: str):
+    """Compiled currency-label pattern, cached per escaped marker."""
+    return re.compile(esc, re.IGNORECASE)
+
+
 def _parse_price(price_str: str):
     s = price_str.strip()
-    if re.match(r'^\d{1,3}(\.\d{3})+(,\d{1,2})?$', s):
+    if _PAT_EURO_FMT.match(s):
         s = s.replace('.', '').replace(',', '.')
-    elif re.match(r'^\d+(,\d{1,2})$', s):
+    elif _PAT_COMMA_DEC.match(s):
         s = s.replace(',', '.')
     else:
         s = s.replace(',', '')
@@ -106,8 +118,8 @@ def convert_prices(pdf_bytes, from_currency, multiplier, to_currency, progress_c
     esc = re.escape(fc)
     fc_is_symbol = len(fc) <= 2 and not fc.isalpha()
 
-    pat_price = re.compile(r'\d{1,3}(?:[.,]\d{3})*[.,]\d{2}|\d+[.,]\d{2}')
-    pat_label = re.compile(esc, re.IGNORECASE)
+    pat_price = _PAT_PRICE
+    pat_label = _label_pattern(esc)
 
     total_pages = len(doc)
     total_converted = 0